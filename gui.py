@@ -1,16 +1,574 @@
 import os
 import sys
 import subprocess
-import shlex
 import re
+import json
+import functools
+import collections
+import ctypes
+import socket
+import threading
+import time
 from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QTreeWidget, QTreeWidgetItem, 
-                             QLabel, QFileDialog, QLineEdit, QGroupBox, QTabWidget,
-                             QTextEdit, QSplitter, QScrollArea, QListWidget, QGridLayout, QHeaderView)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                             QLabel, QFileDialog, QLineEdit, QGroupBox, QTabWidget, QSpinBox,
+                             QTextEdit, QSplitter, QScrollArea, QListWidget, QGridLayout, QHeaderView, QStyle)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QTimer, QProcess,
+                          QObject, QRunnable, QThreadPool)
 from PyQt5.QtGui import QFont
 
+# Number of adb exec-out dumps run concurrently. Small partitions are dominated
+# by adb start-up latency, but adb's USB transport does not scale past a few streams.
+MAX_PARALLEL_DUMPS = 3
+
+# Upper bound offered for the parallel dump setting; more concurrent
+# exec-out streams only make adbd and the USB link thrash
+DUMP_PARALLELISM_LIMIT = 4
+
+# dd block size for dumps. 1 MiB lets adb fill whole USB bulk transfers instead of
+# framing every 4 KiB read; given in bytes since older toolbox dd lacks the M suffix
+DUMP_BLOCK_SIZE = 1024 * 1024
+
+# Seconds between page-cache trims while an adb dump is running
+DUMP_POLL_INTERVAL = 0.5
+
+# Attempts per partition before a dump is reported as failed; between attempts
+# offline devices are reconnected and the delay doubles from DUMP_RETRY_DELAY
+DUMP_ATTEMPTS = 3
+DUMP_RETRY_DELAY = 0.5
+
+# fallocate(2) flag reserving blocks without changing the file size. Unlike
+# os.posix_fallocate this never falls back to writing zeros, and FAT only
+# zero-fills a range when it is allocated without it.
+_FALLOC_FL_KEEP_SIZE = 0x01
+_LIBC = ctypes.CDLL(None, use_errno=True) if sys.platform.startswith('linux') else None
+
+# Partition layouts are static per device, so the last listing is cached per serial
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'adb-partition-dumper')
+
+# Local adb server; shell commands are sent to it directly instead of
+# spawning an adb client process per command
+ADB_SERVER_ADDR = ('127.0.0.1', 5037)
+_ADB_EXIT_MARKER = '__ADB_EXIT__'
+
+# One "[key]: [value]" line of getprop output
+_GETPROP_LINE = re.compile(r'^\[(.*?)\]: \[(.*?)\]*\r?$', re.MULTILINE)
+
+# adb client errors meaning the connection dropped rather than the read
+# failing; only these (and exit status 255 or a short image) are retried
+_ADB_TRANSPORT_ERROR = re.compile(
+    r'device (?:offline|not found|still connecting)|no devices|'
+    r'protocol fault|connection reset|error: closed', re.IGNORECASE)
+
+# Partition names accepted for dumping; they end up in a device-side shell command
+_PARTITION_NAME = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+# str.translate tables deleting ASCII characters unsafe in file names; the
+# label variant keeps spaces for device names
+_UNSAFE_NAME_CHARS = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c in '-_')))
+_UNSAFE_LABEL_CHARS = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c in ' -_')))
+
+# Property categories as (category, key prefixes), most specific first; the
+# first rule with a matching prefix decides a key's category
+_CATEGORY_RULES = (
+    ("Build", ('ro.build.', 'build.', 'ro.system.build.', 'ro.vendor.build.', 'ro.odm.build.', 'ro.product.build.')),
+    ("Product", ('ro.product.',)),
+    ("Vendor", ('ro.vendor.', 'vendor.')),
+    ("Boot", ('ro.boot', 'ro.bootloader', 'boot.', 'init.svc', 'init.svc_debug_pid', 'ro.boottime.', 'service.bootanim')),
+    ("Runtime/ART", ('dalvik.', 'pm.dexopt', 'ro.zygote', 'sys.system_server', 'sys.boot', 'sys.use_memfd', 'ro.runtime.', 'tombstoned.')),
+    ("Radio/Telephony", ('ril.', 'gsm.', 'telephony.', 'ro.telephony.', 'keyguard.')),
+    ("Network/Wi‑Fi", ('net.', 'wifi.', 'wlan.', 'dhcp.', 'ro.wifi.', 'wificond', 'wifi.', 'netd', 'ro.opengles.')),
+    ("USB", ('usb.', 'sys.usb.', 'persist.sys.usb.', 'ro.usb.', 'vendor.usb.', 'init.svc.vendor.usb')),
+    ("Bluetooth", ('bluetooth', 'bt.', 'vendor.bluetooth', 'persist.bluetooth', 'net.bt.')),
+    ("Audio/Media", ('audio.', 'media.', 'vendor.audio', 'av.offload', 'qcom.audio.', 'log.tag.APM_AudioPolicyManager', 'media.recorder.')),
+    ("Graphics/Display", ('graphics.', 'debug.sf.', 'ro.hwui.', 'vendor.hwcomposer', 'gralloc', 'ro.sf.')),
+    ("NFC", ('nfc.', 'ro.nfc.')),
+    ("Storage/FS", ('vold.', 'ro.crypto', 'ro.storage', 'selinux.restorecon_recursive')),
+    ("Services/Daemons", ('service.', 'hwservicemanager', 'servicemanager', 'vndservicemanager', 'ro.persistent_properties')),
+    ("Security", ('security.', 'selinux.', 'ro.secure', 'ro.secwvk', 'ro.control_privapp_permissions')),
+    ("Debug/Logging", ('persist.', 'debug.', 'log.', 'logd.', 'ro.logd.')),
+    ("System (ro.*)", ('ro.',)),
+)
+_STORAGE_RULE = next(i for i, (category, _) in enumerate(_CATEGORY_RULES) if category == "Storage/FS")
+
+
+def _build_prefix_trie(rules):
+    """Build a dict-of-dicts trie over the rule prefixes.
+
+    Each node maps a character to its child node; the None key holds the
+    index of the earliest rule whose prefix ends at that node.
+    """
+    trie = {}
+    for index, (_, prefixes) in enumerate(rules):
+        for prefix in prefixes:
+            node = trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node.setdefault(None, index)
+    return trie
+
+
+_CATEGORY_TRIE = _build_prefix_trie(_CATEGORY_RULES)
+
+# (divisor, unit) indexed by floor(log1024(size)); the bytes entry has no unit suffix
+_SIZE_UNITS = ((1, None), (1024, 'KB'), (1024**2, 'MB'), (1024**3, 'GB'))
+
+
+def format_size(size_bytes):
+    """Format a byte count as e.g. "2.0 MB (2,097,152 bytes)"."""
+    # bit_length picks the unit directly instead of testing each threshold
+    idx = min(max((size_bytes.bit_length() - 1) // 10, 0), len(_SIZE_UNITS) - 1)
+    divisor, unit = _SIZE_UNITS[idx]
+    if unit is None:
+        return f"{size_bytes:,} bytes"
+    return f"{round(size_bytes / divisor, 2)} {unit} ({size_bytes:,} bytes)"
+
+
+
+def _adb_request(sock, request):
+    """Send one adb server request and wait for its OKAY."""
+    payload = request.encode('utf-8')
+    sock.sendall(b'%04x' % len(payload) + payload)
+    status = _adb_recv_exact(sock, 4)
+    if status != b'OKAY':
+        length = int(_adb_recv_exact(sock, 4), 16)
+        raise ConnectionError(_adb_recv_exact(sock, length).decode('utf-8', 'replace'))
+
+
+def _adb_recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("adb server closed the connection")
+        data += chunk
+    return data
+
+
+def run_adb_shell(cmd):
+    """Run a shell command on the device and return a text CompletedProcess.
+
+    The command goes to the adb server's socket (exec: service) so no adb
+    client process is spawned; stderr arrives merged into stdout. If the
+    server is not reachable the adb binary is used instead, which also
+    starts the server for the next call.
+    """
+    try:
+        with socket.create_connection(ADB_SERVER_ADDR, timeout=10) as sock:
+            _adb_request(sock, 'host:transport-any')
+            _adb_request(sock, f'exec:{cmd}; echo "{_ADB_EXIT_MARKER}$?"')
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return subprocess.run(['adb', 'shell', cmd], capture_output=True, text=True)
+
+    output = b''.join(chunks).decode('utf-8', 'replace')
+    stdout, marker, code = output.rpartition(_ADB_EXIT_MARKER)
+    if not marker:
+        return subprocess.CompletedProcess(['adb', 'shell', cmd], 1, output, "")
+    return subprocess.CompletedProcess(['adb', 'shell', cmd], int(code.strip() or 1), stdout, "")
+
+
+def get_adb_serialno():
+    """Return the connected device's serial as a text CompletedProcess.
+
+    Asked of the adb server directly (host:get-serialno), like
+    run_adb_shell, with the same fallback to the adb binary.
+    """
+    try:
+        with socket.create_connection(ADB_SERVER_ADDR, timeout=10) as sock:
+            _adb_request(sock, 'host:get-serialno')
+            length = int(_adb_recv_exact(sock, 4), 16)
+            serial = _adb_recv_exact(sock, length).decode('utf-8', 'replace')
+    except OSError:
+        return subprocess.run(['adb', 'get-serialno'], capture_output=True, text=True)
+    return subprocess.CompletedProcess(['adb', 'get-serialno'], 0, serial + '\n', "")
+
+
+def _reserve_space(fd, size):
+    """Reserve `size` bytes of disk for fd without writing, where the filesystem can.
+
+    Filesystems without a native fallocate (exFAT, FUSE mounts such as
+    ntfs-3g) report EOPNOTSUPP, and the file simply grows as it is written.
+    """
+    fallocate = getattr(_LIBC, 'fallocate64', None) or getattr(_LIBC, 'fallocate', None)
+    if fallocate is None:
+        return
+    fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    fallocate(fd, _FALLOC_FL_KEEP_SIZE, 0, size)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_output_path(path):
+    """Expand $VARS and ~ in an output path and make it absolute (memoized per text)."""
+    # Expand environment variables (like $HOME)
+    path = os.path.expandvars(path)
+    
+    # Expand user home directory (like ~)
+    path = os.path.expanduser(path)
+    
+    # Convert to absolute path
+    return os.path.abspath(path)
+
+
+class LoaderSignals(QObject):
+    """Signals emitted by the ADB loader runnables back to the GUI thread."""
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class PartitionLoader(QRunnable):
+    """Lists the device's partitions via ADB off the GUI thread.
+
+    Emits `loaded` with [partition_id, part_name, size_sectors] rows, or
+    `failed` with the adb error output.
+    """
+
+    # One grep over every size/uevent file; prints "<path>:<line>" so the
+    # device forks a single process instead of grep/cut/cat per partition.
+    # Relative paths keep each output line short.
+    CMD = ("cd /sys/block/mmcblk0 && grep -H -e '^PARTNAME=' -e '^[0-9][0-9]*$' "
+           "mmcblk0p*/size mmcblk0p*/uevent")
+
+    def __init__(self):
+        super().__init__()
+        self.signals = LoaderSignals()
+
+    def run(self):
+        try:
+            result = run_adb_shell(self.CMD)
+        except OSError as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        if result.returncode != 0:
+            self.signals.failed.emit((result.stderr or result.stdout).strip())
+            return
+        self.signals.loaded.emit(self.parse_output(result.stdout))
+
+    def parse_output(self, text):
+        """Parse grep output into [partition_id, part_name, size_sectors] rows."""
+        # Merge size and PARTNAME lines per partition directory
+        sizes = {}
+        names = {}
+        # splitlines() also drops the \r that pty-backed adb shells add
+        for line in text.splitlines():
+            path, sep, value = line.partition(':')
+            if not sep:
+                continue
+            part_dir, _, file_name = path.rpartition('/')
+            partition_id = part_dir[part_dir.rfind('/') + 1:]
+            if file_name == 'size':
+                sizes[partition_id] = value
+            elif value.startswith('PARTNAME='):
+                names[partition_id] = value[9:]
+        return [[partition_id, names.get(partition_id) or "unknown", size_sectors_str]
+                for partition_id, size_sectors_str in sizes.items()]
+
+
+class PropertyLoader(QRunnable):
+    """Runs `getprop` on the device off the GUI thread.
+
+    Emits `loaded` with a (serial, raw getprop text) tuple, or `failed`
+    with the adb error output. The serial is asked for alongside so the
+    output can be cached for the device it actually came from.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = LoaderSignals()
+
+    def run(self):
+        try:
+            serial = get_adb_serialno()
+            result = run_adb_shell('getprop')
+        except OSError as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        if result.returncode != 0:
+            self.signals.failed.emit((result.stderr or result.stdout).strip())
+            return
+        serial = serial.stdout.strip() if serial.returncode == 0 else ''
+        self.signals.loaded.emit((serial, result.stdout))
+
+
+class DumpTaskSignals(QObject):
+    """Signals emitted by DumpTask back to the GUI thread; each carries the task."""
+    started = pyqtSignal(object)
+    progress = pyqtSignal(object, int)
+    transferred = pyqtSignal(object)
+    finished = pyqtSignal(object, bool, str)
+
+
+class DumpTask(QRunnable):
+    """Dumps one partition to an .img file with adb pull, or adb exec-out dd.
+
+    Runs on the dump QThreadPool; `progress` reports the percentage written
+    when the partition size is known, `finished` carries the task, whether
+    the image was written, and an error message on failure. `transferred`
+    is emitted as soon as adb is done, before the image is flushed, so the
+    GUI can start the next partition's transfer in the meantime.
+    """
+
+    # adb pull reads the block device over the sync service, which moves
+    # larger frames than exec-out. It needs a root adbd, so the first failure
+    # switches every later dump to dd until the device is refreshed.
+    pull_supported = True
+
+    def __init__(self, part, dump_file, size_bytes=None):
+        super().__init__()
+        # The GUI's _running_dumps owns the task until its finished signal is
+        # handled; cancel_dumps() may still call tryTake() on it after run()
+        self.setAutoDelete(False)
+        self.part = part
+        self.dump_file = dump_file
+        self.size_bytes = size_bytes
+        self.signals = DumpTaskSignals()
+        self._last_percent = -1
+        # Set from the GUI thread by cancel(); _proc is the running adb transfer
+        self.cancelled = False
+        self._proc = None
+        # Whether this task truncated dump_file or started adb writing to it;
+        # only then is a cancelled dump's file ours to remove
+        self._image_touched = False
+
+    def run(self):
+        device_path = f'/dev/block/by-name/{self.part}'
+        pull_args = ['adb', 'pull', device_path, self.dump_file]
+        dd_args = ['adb', 'exec-out', 'dd', f'if={device_path}',
+                   f'bs={DUMP_BLOCK_SIZE}', 'status=none']
+        # Only dd writes through our own descriptor. adb pull unlinks and
+        # recreates the file by name (and unlinks it again on failure), so a
+        # descriptor opened beforehand would end up on an orphaned inode.
+        fd = None
+        try:
+            pulled = DumpTask.pull_supported
+            try:
+                # Cancelled while waiting for a pool thread: nothing was
+                # written, and an image left by an earlier dump must survive
+                if self.cancelled:
+                    self.signals.finished.emit(self, False, "cancelled")
+                    return
+                self.signals.started.emit(self)
+                for attempt in range(DUMP_ATTEMPTS):
+                    if attempt:
+                        self.recover_connection(attempt)
+                    # Another dump may have found pull unsupported while we waited
+                    pulled = pulled and DumpTask.pull_supported
+                    if pulled:
+                        returncode, stderr = self.run_adb(pull_args, fd)
+                        # Only a refused pull says pull is unsupported; one killed
+                        # by cancel() or a dropped connection is retried as a pull
+                        if (returncode != 0 and not self.cancelled
+                                and not self.transport_failed(returncode, stderr)):
+                            DumpTask.pull_supported = pulled = False
+                    if not pulled:
+                        if self.cancelled:
+                            break
+                        # dd writes at our offset, so every attempt starts from
+                        # a freshly truncated file
+                        if fd is not None:
+                            os.close(fd)
+                            fd = None
+                        fd = self.open_image()
+                        returncode, stderr = self.run_adb(dd_args, fd)
+                    error, written, transient = self.check_image(returncode, stderr, fd)
+                    # Errors reported by the device itself won't go away on retry
+                    if not error or self.cancelled or not transient:
+                        break
+            finally:
+                self.signals.transferred.emit(self)
+
+            if not self.cancelled:
+                if fd is None:
+                    # The pulled image is only reachable by name
+                    fd = os.open(self.dump_file, os.O_RDONLY)
+                else:
+                    # Trim any reservation back to what adb actually wrote
+                    os.ftruncate(fd, written)
+                if hasattr(os, 'fdatasync'):
+                    os.fdatasync(fd)
+                self.drop_cached_pages(fd, 0)
+        except OSError as e:
+            self.signals.finished.emit(self, False, str(e))
+            return
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+        if self.cancelled:
+            # Don't leave a partial image behind that looks like a real dump
+            if self._image_touched:
+                try:
+                    os.remove(self.dump_file)
+                except OSError:
+                    pass
+            self.signals.finished.emit(self, False, "cancelled")
+            return
+
+        self.signals.finished.emit(self, not error, error)
+
+    def open_image(self):
+        """Create (or truncate) the image for dd and reserve its full size."""
+        fd = os.open(self.dump_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._image_touched = True
+        # Reserve the whole image up front: one allocation instead of
+        # growing the file (and its metadata) chunk by chunk
+        if self.size_bytes:
+            _reserve_space(fd, self.size_bytes)
+        return fd
+
+    def check_image(self, returncode, stderr, fd):
+        """Measure a finished transfer; return (why it failed or "", bytes written, transient).
+
+        dd is measured by our descriptor's offset. adb pull replaces the file
+        instead of writing through that descriptor, so a pulled image is
+        verified against whatever file is now at dump_file. `transient` says
+        whether the failure looks like a dropped connection worth retrying.
+        """
+        if fd is None:
+            try:
+                written = os.stat(self.dump_file).st_size
+            except FileNotFoundError:
+                written = None
+        else:
+            written = os.lseek(fd, 0, os.SEEK_CUR)
+
+        # Verify by exit status and by the byte count adb wrote; a partial
+        # read can still exit 0, so the size from sysfs must match when known
+        if returncode != 0:
+            error = stderr.strip() or f"adb exited with {returncode}"
+            return error, written or 0, self.transport_failed(returncode, error)
+        if written is None:
+            return "adb pull left no image", 0, False
+        device_error = self.device_error(fd, written)
+        if device_error:
+            return device_error, written, False
+        if written == 0:
+            return stderr.strip() or "empty image", 0, True
+        if self.size_bytes and written != self.size_bytes:
+            return f"short image: {written:,} of {self.size_bytes:,} bytes", written, True
+        return "", written, False
+
+    @staticmethod
+    def transport_failed(returncode, message):
+        """Return whether a failed adb run lost the connection rather than the read failing."""
+        return returncode == 255 or bool(_ADB_TRANSPORT_ERROR.search(message))
+
+    def device_error(self, fd, written):
+        """Return dd's error message if that is all a dd image holds, else ""."""
+        # exec-out merges the device's stderr into the stream and exits 0,
+        # so a dd that can't read the partition leaves only its message
+        if fd is None or not 0 < written <= 4096 or written == self.size_bytes:
+            return ""
+        with open(self.dump_file, 'rb') as f:
+            head = f.read(written)
+        if not head.startswith(b'dd: '):
+            return ""
+        return head.decode('utf-8', 'replace').strip()
+
+    def recover_connection(self, attempt):
+        """Reconnect offline devices, then wait before retry number `attempt`."""
+        # "offline" leaves healthy connections, and so other running dumps, alone
+        try:
+            subprocess.run(['adb', 'reconnect', 'offline'], capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            pass
+        deadline = time.monotonic() + DUMP_RETRY_DELAY * 2 ** (attempt - 1)
+        while not self.cancelled and time.monotonic() < deadline:
+            time.sleep(0.1)
+        # Progress restarts from zero with the new attempt
+        self._last_percent = -1
+
+    def run_adb(self, args, fd):
+        """Run one adb transfer into the image, returning (returncode, stderr).
+
+        fd is the image descriptor dd writes to, or None for adb pull.
+        """
+        # dd writes straight into the image file, no shell redirection needed;
+        # adb pull opens the file by name and reports on stdout
+        if self.cancelled:
+            return -1, ""
+        proc = subprocess.Popen(args, stdout=subprocess.DEVNULL if fd is None else fd,
+                                stderr=subprocess.PIPE, text=True)
+        self._proc = proc
+        self._image_touched = True
+        # cancel() may have run between the check above and _proc being set
+        if self.cancelled:
+            proc.kill()
+        while True:
+            try:
+                _, stderr = proc.communicate(timeout=DUMP_POLL_INTERVAL)
+                return proc.returncode, stderr
+            except subprocess.TimeoutExpired:
+                written = self.bytes_written(fd)
+                self.drop_cached_pages(fd, written)
+                self.report_progress(written)
+
+    def cancel(self):
+        """Stop the dump from any thread; run() then reports it as cancelled."""
+        self.cancelled = True
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    def report_progress(self, written):
+        """Emit `progress` when the written percentage changes."""
+        # Progress comes from the image file itself, so dd runs with
+        # status=none and there is no stderr output to parse
+        if not self.size_bytes:
+            return
+        percent = min(written * 100 // self.size_bytes, 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signals.progress.emit(self, percent)
+
+    def bytes_written(self, fd):
+        """Return how much of the image adb has written so far (fd None = pull)."""
+        if fd is None:
+            # adb pull writes through its own descriptor to whatever file
+            # currently has our name, which may not exist yet
+            try:
+                return os.stat(self.dump_file).st_size
+            except FileNotFoundError:
+                return 0
+        # dd shares our file offset
+        return os.lseek(fd, 0, os.SEEK_CUR)
+
+    def drop_cached_pages(self, fd, length):
+        """Tell the kernel the image's pages won't be read again (0 = whole file).
+
+        Dumps are written once and rarely read back, so keeping them in the
+        page cache only evicts more useful data. Dirty pages are queued for
+        writeback by the first call and dropped on a later one. With fd None
+        (adb pull) the image is opened by name for the call.
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        if fd is not None:
+            os.posix_fadvise(fd, 0, length, os.POSIX_FADV_DONTNEED)
+            return
+        try:
+            fd = os.open(self.dump_file, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            os.posix_fadvise(fd, 0, length, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
 class PartitionDumper(QWidget):
     """
     A Qt-based GUI application for dumping Android device partitions via ADB.
@@ -50,11 +608,63 @@ class PartitionDumper(QWidget):
     This tool is designed for MMC-based Android devices (mmcblk0 naming convention)
     and may not work with all device types or storage configurations.
     """
+
+    # Status line updates; the label repaints on the next event-loop turn
+    status_changed = pyqtSignal(str)
+
+    # Overview field -> (getprop keys tried in order, default); "Android" and
+    # "ADB Root" combine several properties and are computed in populate_overview
+    _OVERVIEW_SPECS = {
+        "Model": (('ro.product.model', 'ro.product.system.model', 'ro.product.vendor.model', 'ro.product.odm.model'), "Unknown"),
+        "Manufacturer": (('ro.product.manufacturer', 'ro.product.vendor.manufacturer'), ""),
+        "Security Patch": (('ro.build.version.security_patch',), ""),
+        "Build ID": (('ro.build.id',), ""),
+        "Build Display": (('ro.build.display.id',), ""),
+        "Fingerprint": (('ro.build.fingerprint',), ""),
+        "Device": (('ro.product.device',), ""),
+        "Name": (('ro.product.name',), ""),
+        "Board": (('ro.product.board', 'ro.board.platform'), ""),
+        "Bootloader": (('ro.bootloader', 'ro.boot.bootloader'), ""),
+        "Baseband": (('gsm.version.baseband',), ""),
+        "Serial": (('ro.serialno', 'ro.boot.serialno'), ""),
+        "LineageOS": (('ro.lineage.display.version', 'ro.modversion', 'ro.lineage.version'), ""),
+        "Treble": (('ro.treble.enabled',), ""),
+    }
     
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ADB Partition Dumper")
         self.layout = QVBoxLayout()
+
+        # Dump workers: DumpTask -> its tree item for every queued/running dump;
+        # keyed by task since partitions without a PARTNAME share "unknown"
+        # Twice as many threads as parallel transfers: finished images flush
+        # to disk while the next adb transfers already run. Tasks not started
+        # yet wait in _dump_queue, in the order their transfers should begin.
+        self.dump_pool = QThreadPool(self)
+        self._running_dumps = {}
+        self._dump_queue = collections.deque()
+        self._transfers_running = 0
+        # Rows currently in the partition tree, in display order
+        self._partition_items = []
+        # (row count, column widths) of the last window fit, and the row and
+        # header heights measured for it; fonts don't change, so they are kept
+        self._last_fit = None
+        self._row_height = None
+        self._header_height = None
+        # Parsed getprop output of the connected device ({} until loaded)
+        # and memoized (device_name, serial) pairs by serial; entries are
+        # dropped when `adb track-devices` reports their device gone
+        self._props_dict = {}
+        self._device_info_cache = {}
+        self._track_buffer = b''
+        self.device_tracker = QProcess(self)
+        self.device_tracker.readyReadStandardOutput.connect(self._on_track_devices_output)
+        self.device_tracker.start('adb', ['track-devices'])
+        # Property rows of the Device Info tree; see populate_properties_tree()
+        self._prop_index = []
+        # getprop only runs once the Device Info tab is first opened
+        self._device_info_loaded = False
         
         # Create tab widget
         self.tab_widget = QTabWidget()
@@ -68,12 +678,22 @@ class PartitionDumper(QWidget):
         self.device_info_tab = QWidget()
         self.setup_device_info_tab()
         self.tab_widget.addTab(self.device_info_tab, "Device Info")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         self.layout.addWidget(self.tab_widget)
         self.setLayout(self.layout)
         
+        # Start the device listing first so it runs on the pool while the
+        # serial lookup and cached layout are handled here; its result is
+        # only delivered once the event loop runs, after the cache is shown
         self.load_partitions()
-        self.load_device_info()
+        self.load_cached_partitions()
+
+    def _on_tab_changed(self, index):
+        """Load the device properties the first time the Device Info tab is shown."""
+        if self.tab_widget.widget(index) is self.device_info_tab and not self._device_info_loaded:
+            self._device_info_loaded = True
+            self.load_device_info()
 
     def setup_partition_tab(self):
         """Setup the original partition dumper interface."""
@@ -86,18 +706,32 @@ class PartitionDumper(QWidget):
         self.list_widget = QTreeWidget()
         self.list_widget.setHeaderLabels(["Partition", "Size", "Status"])
         self.list_widget.setColumnCount(3)
+        self.list_widget.setUniformRowHeights(True)
         
-        # Dump button
+        # Dump button and number of partitions transferred at once
         self.dump_button = QPushButton("Dump Selected Partitions")
         self.dump_button.clicked.connect(self.dump_partitions)
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, DUMP_PARALLELISM_LIMIT)
+        self.parallel_spin.setValue(MAX_PARALLEL_DUMPS)
+        self.parallel_spin.setToolTip("Number of partitions dumped at the same time")
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_dumps)
+        dump_layout = QHBoxLayout()
+        dump_layout.addWidget(self.dump_button, 1)
+        dump_layout.addWidget(self.cancel_button)
+        dump_layout.addWidget(QLabel("Parallel:"))
+        dump_layout.addWidget(self.parallel_spin)
         
         # Status label
         self.status_label = QLabel("Status: Ready")
+        self.status_changed.connect(self.status_label.setText)
         
         # Add widgets to layout
         layout.addWidget(self.output_group)
         layout.addWidget(self.list_widget)
-        layout.addWidget(self.dump_button)
+        layout.addLayout(dump_layout)
         layout.addWidget(self.status_label)
         
         self.partition_tab.setLayout(layout)
@@ -130,9 +764,14 @@ class PartitionDumper(QWidget):
         tool = QHBoxLayout()
         self.filter_edit = QLineEdit()
         self.filter_edit.setPlaceholderText("Filter properties (substring or regex)...")
-        self.filter_edit.textChanged.connect(self.apply_property_filter)
+        # Filter once typing pauses rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(100)
+        self.filter_timer.timeout.connect(self.apply_property_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self.load_device_info)
+        refresh_btn.clicked.connect(self.refresh_device)
         copy_overview_btn = QPushButton("Copy Overview")
         copy_overview_btn.clicked.connect(self.copy_overview)
         copy_filtered_btn = QPushButton("Copy Filtered")
@@ -179,7 +818,9 @@ class PartitionDumper(QWidget):
         
         # Copy button for this category
         copy_button = QPushButton(f"Copy {category_name}")
-        copy_button.clicked.connect(lambda checked, cat=category_name: self.copy_property_list(cat))
+        # One shared slot for every category; the button names its category
+        copy_button.setObjectName(category_name)
+        copy_button.clicked.connect(self._on_copy_clicked)
         
         group_layout.addWidget(list_widget)
         group_layout.addWidget(copy_button)
@@ -188,6 +829,10 @@ class PartitionDumper(QWidget):
         self.property_lists[category_name] = list_widget
         return group
 
+    def _on_copy_clicked(self):
+        """Copy the property list of the category whose button was clicked."""
+        self.copy_property_list(self.sender().objectName())
+
     def copy_property_list(self, category):
         """Copy specific property list to clipboard."""
         list_widget = self.property_lists[category]
@@ -261,16 +906,7 @@ class PartitionDumper(QWidget):
         if not path:
             path = "./dumped"  # Default fallback
             
-        # Expand environment variables (like $HOME)
-        path = os.path.expandvars(path)
-        
-        # Expand user home directory (like ~)
-        path = os.path.expanduser(path)
-        
-        # Convert to absolute path
-        path = os.path.abspath(path)
-        
-        return path
+        return _resolve_output_path(path)
 
     def ensure_output_directory(self):
         """
@@ -280,108 +916,219 @@ class PartitionDumper(QWidget):
             bool: True if directory exists or was created successfully, False otherwise
         """
         try:
-            output_path = self.get_resolved_output_path()
-            
-            if not os.path.exists(output_path):
-                os.makedirs(output_path, exist_ok=True)
-                self.status_label.setText(f"Status: Created directory {output_path}")
-                QApplication.processEvents()
-                
+            # exist_ok covers the pre-existing case without a separate stat
+            os.makedirs(self.get_resolved_output_path(), exist_ok=True)
             return True
             
-        except Exception as e:
-            self.status_label.setText(f"Status: Error creating directory - {str(e)}")
+        except OSError as e:
+            self.status_changed.emit(f"Status: Error creating directory - {str(e)}")
             return False
 
     def create_default_folder_name(self, device_name, serial):
         """Create a safe folder name from device name and serial"""
         # Remove invalid characters and replace spaces with underscores
-        safe_name = "".join(c for c in device_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_name = device_name.translate(_UNSAFE_LABEL_CHARS).strip()
         safe_name = safe_name.replace(' ', '_')
-        safe_serial = "".join(c for c in serial if c.isalnum() or c in ('-', '_')).strip()
+        safe_serial = serial.translate(_UNSAFE_NAME_CHARS).strip()
         
         return f"{safe_name}_{safe_serial}"
 
     def load_partitions(self):
-        """Loads partition information from an Android device via ADB and populates a QTreeWidget."""
-        # Single command that outputs: partition_name|actual_name|size_bytes
-        cmd = '''for part in /sys/block/mmcblk0/mmcblk0p*; do 
-            name=$(grep ^PARTNAME= "$part/uevent" 2>/dev/null | cut -d= -f2)
-            size=$(cat "$part/size" 2>/dev/null)
-            if [ -n "$size" ]; then
-                echo "$(basename "$part")|${name:-unknown}|$size"
-            fi
-        done'''
-        
-        result = subprocess.run(['adb', 'shell', cmd], capture_output=True, text=True)
-        
-        if result.returncode != 0:
+        """Start loading partition information from the device on the global thread pool."""
+        if self.list_widget.topLevelItemCount() == 0:
+            self.status_label.setText("Status: Loading partitions...")
+            # Dropped again by populate_partitions or _on_partitions_failed
+            self.list_widget.addTopLevelItem(self.create_placeholder_item())
+
+        loader = PartitionLoader()
+        loader.signals.loaded.connect(self._on_partitions_loaded)
+        loader.signals.failed.connect(self._on_partitions_failed)
+        # Keep the signal holder alive until the loader reports back
+        self._partition_loader = loader
+        QThreadPool.globalInstance().start(loader)
+
+    def create_placeholder_item(self):
+        """Return a disabled "Loading..." row shown until data arrives."""
+        item = QTreeWidgetItem(["Loading..."])
+        item.setFlags(Qt.NoItemFlags)
+        return item
+
+    def _on_partitions_loaded(self, rows):
+        """Populate the QTreeWidget with rows parsed by PartitionLoader."""
+        self.populate_partitions(rows)
+        self.save_partition_cache(rows)
+        self.status_label.setText("Status: Ready")
+
+    def _on_partitions_failed(self, message):
+        """Report a failed partition listing."""
+        if not self._partition_items:
+            self.list_widget.clear()
+        if message:
+            self.status_label.setText(f"Status: Failed to load partitions - {message}")
+        else:
             self.status_label.setText("Status: Failed to load partitions")
-            return
-        
+
+    def populate_partitions(self, rows):
+        """Fill the partition tree from parsed rows, reusing rows already shown.
+
+        Existing items (e.g. from the cache) keep their check and dump state;
+        only sizes are updated, new partitions are added and missing ones dropped.
+        """
+        # Detach all current rows in one call; they are re-added below
+        # Names aren't unique (every partition without a PARTNAME is
+        # "unknown"), so each name maps to its rows in display order
+        existing = {}
+        for item in self.list_widget.invisibleRootItem().takeChildren():
+            existing.setdefault(item.text(0), []).append(item)
+
         # Collect all partition data first
         partition_data = []
-        for line in result.stdout.strip().split('\n'):
-            if '|' in line:
-                parts = line.split('|')
-                if len(parts) == 3:
-                    partition_id, part_name, size_sectors_str = parts
-                    try:
-                        # Convert to Python int (unlimited precision) first, then to bytes
-                        size_sectors = int(size_sectors_str)
-                        size_bytes = size_sectors * 512
-                        
-                        # Show readable format with exact bytes
-                        if size_bytes >= 1024**3:  # GB
-                            size_gb = round(size_bytes / (1024**3), 2)
-                            size_str = f"{size_gb} GB ({size_bytes:,} bytes)"
-                        elif size_bytes >= 1024**2:  # MB
-                            size_mb = round(size_bytes / (1024**2), 2)
-                            size_str = f"{size_mb} MB ({size_bytes:,} bytes)"
-                        elif size_bytes >= 1024:  # KB
-                            size_kb = round(size_bytes / 1024, 2)
-                            size_str = f"{size_kb} KB ({size_bytes:,} bytes)"
-                        else:  # Bytes
-                            size_str = f"{size_bytes:,} bytes"
-                            
-                    except ValueError:
-                        size_str = "Unknown"
-                    
-                    partition_data.append((part_name, size_str))
+        for partition_id, part_name, size_sectors_str in rows:
+            try:
+                # Convert to Python int (unlimited precision) first, then to bytes
+                size_sectors = int(size_sectors_str)
+                size_bytes = size_sectors * 512
+                size_str = format_size(size_bytes)
+            except ValueError:
+                size_bytes = None
+                size_str = "Unknown"
+            
+            partition_data.append((part_name, size_str, size_bytes))
         
         # Sort by partition name (alphabetically)
         partition_data.sort(key=lambda x: x[0].lower())
         
-        # Add sorted items to the widget
-        for part_name, size_str in partition_data:
-            item = QTreeWidgetItem([part_name, size_str, "Pending"])
-            item.setCheckState(0, Qt.Unchecked)
-            self.list_widget.addTopLevelItem(item)
+        # Build all rows first, then insert them with a single relayout
+        items = []
+        for part_name, size_str, size_bytes in partition_data:
+            same_name = existing.get(part_name)
+            item = same_name.pop(0) if same_name else None
+            if item is None:
+                item = QTreeWidgetItem([part_name, size_str, "Pending"])
+                item.setCheckState(0, Qt.Unchecked)
+            else:
+                item.setText(1, size_str)
+            # Keep the exact size around for the dump stage
+            item.setData(0, Qt.UserRole, size_bytes)
+            items.append(item)
+
+        self.list_widget.setUpdatesEnabled(False)
+        self.list_widget.setSortingEnabled(False)
+        self.list_widget.addTopLevelItems(items)
+        self._partition_items = items
         
-        # Auto-resize columns to fit content with custom padding
-        self.list_widget.resizeColumnToContents(0)  # Partition column
-        self.list_widget.resizeColumnToContents(1)  # Size column  
-        self.list_widget.resizeColumnToContents(2)  # Status column
+        # Size columns from the texts we already have instead of letting
+        # resizeColumnToContents lay out every item of every column
+        fm = self.list_widget.fontMetrics()
+        header = self.list_widget.header()
+        style = self.list_widget.style()
+        # Item views pad each cell by the focus frame margin on both sides
+        margin = 2 * (style.pixelMetric(QStyle.PM_FocusFrameHMargin) + 1)
+        # The partition column also holds the check box and the item indentation
+        check_width = (style.pixelMetric(QStyle.PM_IndicatorWidth)
+                       + style.pixelMetric(QStyle.PM_CheckBoxLabelSpacing)
+                       + self.list_widget.indentation())
+        columns = (
+            ([name for name, _, _ in partition_data], margin + check_width),
+            ([size_str for _, size_str, _ in partition_data], margin),
+            (["Pending", "Queued", "Dumping", "Done", "Failed", "Cancelled"], margin),
+        )
 
         # Add custom padding to each column
         partition_padding = 15
         size_padding = 25      # Size column needs more space due to long text
         status_padding = 15
 
-        self.list_widget.setColumnWidth(0, self.list_widget.columnWidth(0) + partition_padding)
-        self.list_widget.setColumnWidth(1, self.list_widget.columnWidth(1) + size_padding)
-        self.list_widget.setColumnWidth(2, self.list_widget.columnWidth(2) + status_padding)
+        for column, ((texts, extra), padding) in enumerate(
+                zip(columns, (partition_padding, size_padding, status_padding))):
+            text_width = max(map(fm.horizontalAdvance, texts), default=0) + extra
+            width = max(text_width, header.sectionSizeHint(column)) + padding
+            # A refresh with the same rows leaves the header geometry alone
+            if width != self.list_widget.columnWidth(column):
+                self.list_widget.setColumnWidth(column, width)
+
+        # Insertion and column widths are laid out and painted together
+        self.list_widget.setUpdatesEnabled(True)
 
         # Calculate and set window size to fit content
         self.resize_to_fit_content()
 
+    def get_partition_cache_path(self):
+        """Return the cache file for the connected device, or None if it has no serial."""
+        return self.get_device_cache_path('.json')
+
+    def get_property_cache_path(self, serial=None):
+        """Return the getprop cache file for a device (default: the connected one), or None."""
+        return self.get_device_cache_path('.getprop', serial)
+
+    def get_device_cache_path(self, extension, serial=None):
+        """Return CACHE_DIR/<serial><extension>, or None if there is no usable serial."""
+        if serial is None:
+            serial = getattr(self, 'device_serial', '')
+        safe_serial = serial.translate(_UNSAFE_NAME_CHARS)
+        if not safe_serial or safe_serial == 'unknown':
+            return None
+        return os.path.join(CACHE_DIR, f"{safe_serial}{extension}")
+
+    def update_device_serial(self):
+        """Ask adb for the connected device's serial and keep it in device_serial."""
+        try:
+            result = get_adb_serialno()
+            result.check_returncode()
+            self.device_serial = result.stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            self.device_serial = ''
+        return self.device_serial
+
+    def load_cached_partitions(self):
+        """Populate the partition tree from the on-disk cache for the connected device."""
+        if not self.update_device_serial():
+            return
+
+        cache_path = self.get_partition_cache_path()
+        if not cache_path:
+            return
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.populate_partitions(rows)
+        self.status_label.setText("Status: Loaded cached partitions, refreshing...")
+
+    def save_partition_cache(self, rows):
+        """Write the latest partition listing to the per-device cache."""
+        cache_path = self.get_partition_cache_path()
+        if not cache_path:
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(rows, f)
+        except OSError:
+            # The cache is only an optimization
+            pass
+
     def resize_to_fit_content(self):
-        """Resize the window to fit the tree widget content without scrollbars."""
-        # Force layout update first
-        QApplication.processEvents()
-        
+        """Resize the window to fit the tree widget content without scrollbars.
+
+        The measurement is deferred to the next event-loop turn so it runs
+        after Qt's own layout pass instead of forcing one.
+        """
+        QTimer.singleShot(0, self._do_resize)
+
+    def _do_resize(self):
+        """Compute the window size from column widths and a uniform row height."""
         # Calculate total width needed (columns + margins)
-        total_column_width = sum(self.list_widget.columnWidth(i) for i in range(3))
+        column_widths = tuple(self.list_widget.columnWidth(i) for i in range(3))
+        total_column_width = sum(column_widths)
+        row_count = self.list_widget.topLevelItemCount()
+
+        # A refresh that changed neither rows nor widths needs no new fit
+        if (row_count, column_widths) == self._last_fit:
+            return
+        self._last_fit = (row_count, column_widths)
         
         # Account for tree widget frame, potential scrollbar space, and window margins
         frame_width = self.list_widget.frameWidth() * 2  # Left and right frame
@@ -391,18 +1138,19 @@ class PartitionDumper(QWidget):
         total_width = total_column_width + frame_width + scrollbar_width + window_margins
         
         # Calculate height needed - use actual row count (not minus 1)
-        row_count = self.list_widget.topLevelItemCount()
-        
-        if row_count > 0:
-            # Get actual row height from first item
-            first_item = self.list_widget.topLevelItem(0)
-            item_rect = self.list_widget.visualItemRect(first_item)
-            row_height = item_rect.height()
-        else:
-            row_height = 25  # Fallback
+        # Rows are uniform, so the first row's size hint holds for all of them
+        row_height = self._row_height
+        if row_height is None:
+            row_height = self.list_widget.sizeHintForRow(0) if row_count > 0 else -1
+            if row_height > 0:
+                self._row_height = row_height
+            else:
+                row_height = self.list_widget.fontMetrics().height() + 4
         
         # Calculate exact tree widget height needed
-        header_height = self.list_widget.header().height()
+        if self._header_height is None:
+            self._header_height = self.list_widget.header().sizeHint().height()
+        header_height = self._header_height
         rows_height = row_count * row_height  # Use full row count
         
         # Only add the frame for the tree widget border
@@ -446,43 +1194,79 @@ class PartitionDumper(QWidget):
             self.resize(800, 600)
 
     def load_device_info(self):
-        """Fetch, parse, summarize, categorize, and render device properties."""
-        def _post_load(all_props_text):
-            self.all_properties = all_props_text
-            props = self.parse_getprop_output(all_props_text)
-            self.populate_overview(props)
-            self.populate_properties_tree(props)
-            # Apply current filter (if any)
-            self.apply_property_filter()
+        """Show cached device properties, then fetch them on the global thread pool."""
+        cache_path = self.get_property_cache_path()
+        if cache_path and not self._props_dict:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self.apply_device_properties(f.read())
+            except OSError:
+                pass
+        if not self._props_dict:
+            self.props_tree.clear()
+            self._prop_index = []
+            self.props_tree.addTopLevelItem(self.create_placeholder_item())
+
+        loader = PropertyLoader()
+        loader.signals.loaded.connect(self._on_device_info_loaded)
+        loader.signals.failed.connect(self._on_device_info_failed)
+        # Keep the signal holder alive until the loader reports back
+        self._property_loader = loader
+        QThreadPool.globalInstance().start(loader)
+
+    def apply_device_properties(self, all_props_text):
+        """Parse, summarize, categorize, and render getprop output."""
+        self.all_properties = all_props_text
+        props = self.parse_getprop_output(all_props_text)
+        self._props_dict = props
+        self.populate_overview(props)
+        self.populate_properties_tree(props)
+        # Apply current filter (if any)
+        self.apply_property_filter()
 
+    def _on_device_info_loaded(self, result):
+        """Render fresh (serial, getprop output) and keep it for the next start."""
+        serial, all_props_text = result
+        # Nothing to redraw when the device still reports the cached values
+        if not self._props_dict or all_props_text != self.all_properties:
+            self.apply_device_properties(all_props_text)
+        # The shown properties now belong to this device, even if another
+        # one was connected when the window opened
+        self.device_serial = serial
+
+        cache_path = self.get_property_cache_path(serial)
+        if not cache_path:
+            return
         try:
-            result = subprocess.run(['adb', 'shell', 'getprop'],
-                                    capture_output=True, text=True, check=True)
-            _post_load(result.stdout)
-        except subprocess.CalledProcessError:
-            # Fallback to local sample if ADB fails
-            try:
-                fallback_path = os.path.join(os.path.dirname(__file__), 'adb_shell_getprop.output')
-                with open(fallback_path, 'r', encoding='utf-8') as f:
-                    _post_load(f.read())
-            except Exception as e:
-                # Minimal error display
-                self.props_tree.clear()
-                root = QTreeWidgetItem(["Error", f"Failed to load properties: {str(e)}"])
-                self.props_tree.addTopLevelItem(root)
-                self.all_properties = "Error loading properties."
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                f.write(all_props_text)
+        except OSError:
+            # The cache is only an optimization
+            pass
+
+    def _on_device_info_failed(self, message):
+        """Fall back to a local getprop sample if ADB fails."""
+        # Properties shown from the cache are better than the sample
+        if self._props_dict:
+            return
+        try:
+            fallback_path = os.path.join(os.path.dirname(__file__), 'adb_shell_getprop.output')
+            with open(fallback_path, 'r', encoding='utf-8') as f:
+                self.apply_device_properties(f.read())
+        except Exception as e:
+            # Minimal error display
+            self.props_tree.clear()
+            self._prop_index = []
+            root = QTreeWidgetItem(["Error", f"Failed to load properties: {message or str(e)}"])
+            self.props_tree.addTopLevelItem(root)
+            self.all_properties = "Error loading properties."
 
     # Helpers: parsing and categorization
 
     def parse_getprop_output(self, text):
         """Parse adb shell getprop output into dict."""
-        props = {}
-        for line in text.strip().splitlines():
-            if line.startswith('[') and ']: [' in line:
-                key = line.split(']: [', 1)[0][1:]
-                value = line.split(']: [', 1)[1].rstrip(']')
-                props[key] = value
-        return props
+        return dict(_GETPROP_LINE.findall(text))
 
     def get_prop(self, props, keys, default=""):
         """Return first non-empty/non-unknown value for keys."""
@@ -501,111 +1285,120 @@ class PartitionDumper(QWidget):
         adb_root_raw = self.get_prop(props, ['service.adb.root', 'init.svc.adb_root'])
         adb_root = "Yes" if adb_root_raw in ("1", "running", "true", "True") else ("No" if adb_root_raw else "")
 
-        overview = {
-            "Model": self.get_prop(props, ['ro.product.model', 'ro.product.system.model', 'ro.product.vendor.model', 'ro.product.odm.model'], "Unknown"),
-            "Manufacturer": self.get_prop(props, ['ro.product.manufacturer', 'ro.product.vendor.manufacturer']),
-            "Android": android_display,
-            "Security Patch": self.get_prop(props, ['ro.build.version.security_patch']),
-            "Build ID": self.get_prop(props, ['ro.build.id']),
-            "Build Display": self.get_prop(props, ['ro.build.display.id']),
-            "Fingerprint": self.get_prop(props, ['ro.build.fingerprint']),
-            "Device": self.get_prop(props, ['ro.product.device']),
-            "Name": self.get_prop(props, ['ro.product.name']),
-            "Board": self.get_prop(props, ['ro.product.board', 'ro.board.platform']),
-            "Bootloader": self.get_prop(props, ['ro.bootloader', 'ro.boot.bootloader']),
-            "Baseband": self.get_prop(props, ['gsm.version.baseband']),
-            "Serial": self.get_prop(props, ['ro.serialno', 'ro.boot.serialno']),
-            "LineageOS": self.get_prop(props, ['ro.lineage.display.version', 'ro.modversion', 'ro.lineage.version']),
-            "Treble": self.get_prop(props, ['ro.treble.enabled']),
-            "ADB Root": adb_root,
-        }
+        overview = {field: self.get_prop(props, keys, default)
+                    for field, (keys, default) in self._OVERVIEW_SPECS.items()}
+        overview["Android"] = android_display
+        overview["ADB Root"] = adb_root
 
         for field in self.overview_fields:
             val = overview.get(field, "")
             self.overview_labels[field].setText(val)
 
-    def categorize_property(self, key):
-        """Heuristic category for a given prop key."""
-        # Ordered checks from most specific to general
-        if key.startswith(('ro.build.', 'build.', 'ro.system.build.', 'ro.vendor.build.', 'ro.odm.build.', 'ro.product.build.')):
-            return "Build"
-        if key.startswith(('ro.product.',)):
-            return "Product"
-        if key.startswith(('ro.vendor.', 'vendor.')):
-            return "Vendor"
-        if key.startswith(('ro.boot', 'ro.bootloader', 'boot.', 'init.svc', 'init.svc_debug_pid', 'ro.boottime.', 'service.bootanim')):
-            return "Boot"
-        if key.startswith(('dalvik.', 'pm.dexopt', 'ro.zygote', 'sys.system_server', 'sys.boot', 'sys.use_memfd', 'ro.runtime.', 'tombstoned.')):
-            return "Runtime/ART"
-        if key.startswith(('ril.', 'gsm.', 'telephony.', 'ro.telephony.', 'keyguard.')):
-            return "Radio/Telephony"
-        if key.startswith(('net.', 'wifi.', 'wlan.', 'dhcp.', 'ro.wifi.', 'wificond', 'wifi.', 'netd', 'ro.opengles.')):
-            return "Network/Wi‑Fi"
-        if key.startswith(('usb.', 'sys.usb.', 'persist.sys.usb.', 'ro.usb.', 'vendor.usb.', 'init.svc.vendor.usb')):
-            return "USB"
-        if key.startswith(('bluetooth', 'bt.', 'vendor.bluetooth', 'persist.bluetooth', 'net.bt.')):
-            return "Bluetooth"
-        if key.startswith(('audio.', 'media.', 'vendor.audio', 'av.offload', 'qcom.audio.', 'log.tag.APM_AudioPolicyManager', 'media.recorder.')):
-            return "Audio/Media"
-        if key.startswith(('graphics.', 'debug.sf.', 'ro.hwui.', 'vendor.hwcomposer', 'gralloc', 'ro.sf.')):
-            return "Graphics/Display"
-        if key.startswith(('nfc.', 'ro.nfc.')):
-            return "NFC"
-        if key.startswith(('vold.', 'ro.crypto', 'ro.storage', 'selinux.restorecon_recursive')) or 'fstab' in key or key.endswith('.fsck'):
-            return "Storage/FS"
-        if key.startswith(('service.', 'hwservicemanager', 'servicemanager', 'vndservicemanager', 'ro.persistent_properties')):
-            return "Services/Daemons"
-        if key.startswith(('security.', 'selinux.', 'ro.secure', 'ro.secwvk', 'ro.control_privapp_permissions')):
-            return "Security"
-        if key.startswith(('persist.', 'debug.', 'log.', 'logd.', 'ro.logd.')):
-            return "Debug/Logging"
-        if key.startswith('ro.'):
-            return "System (ro.*)"
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def categorize_property(key):
+        """Heuristic category for a given prop key (memoized across refreshes)."""
+        # One walk down the prefix trie finds every rule whose prefix matches;
+        # the earliest rule wins, as in the ordered checks it was built from
+        node = _CATEGORY_TRIE
+        best = len(_CATEGORY_RULES)
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                break
+            best = min(best, node.get(None, best))
+        # Storage also matches on substrings and suffixes, not just prefixes
+        if best > _STORAGE_RULE and ('fstab' in key or key.endswith('.fsck')):
+            best = _STORAGE_RULE
+        if best < len(_CATEGORY_RULES):
+            return _CATEGORY_RULES[best][0]
         return "Other"
 
     def populate_properties_tree(self, props):
-        """Fill the tree with categorized properties."""
-        self.props_tree.clear()
+        """Fill the tree with categorized properties, updating rows already shown.
+
+        Items from the previous fill are reused: changed values are updated in
+        place and rows are only re-seated where keys or categories came or went.
+        """
+        # One repaint for the whole batch instead of one per changed row
+        self.props_tree.setUpdatesEnabled(False)
+        try:
+            self._fill_properties_tree(props)
+        finally:
+            self.props_tree.setUpdatesEnabled(True)
+
+    def _fill_properties_tree(self, props):
+        """Body of populate_properties_tree, run with tree updates disabled."""
+        # Nothing to reuse after a placeholder or error row
+        if not self._prop_index:
+            self.props_tree.clear()
+        previous = {parent.text(0): (parent, {entry[1]: entry for entry in entries})
+                    for parent, entries in self._prop_index}
+        previous_order = [parent.text(0) for parent, _ in self._prop_index]
+
+        # Parallel key/value/category lists, sorted once by lowercase key and
+        # then split into per-category index lists that are already in order
+        keys = list(props)
+        values = list(props.values())
+        cats = list(map(self.categorize_property, keys))
+        keys_lower = [k.lower() for k in keys]
         categories = {}
-        for k, v in props.items():
-            cat = self.categorize_property(k)
-            categories.setdefault(cat, []).append((k, v))
+        for i in sorted(range(len(keys)), key=keys_lower.__getitem__):
+            categories.setdefault(cats[i], []).append(i)
 
+        # (parent, [(child, key, value, lowercase "key\nvalue")]) per category,
+        # so filtering never reads item texts back from Qt
+        index = []
         for cat in sorted(categories.keys()):
-            parent = QTreeWidgetItem([cat, ""])
-            parent.setFlags(parent.flags() & ~Qt.ItemIsSelectable)
-            self.props_tree.addTopLevelItem(parent)
-            for k, v in sorted(categories[cat], key=lambda x: x[0].lower()):
-                child = QTreeWidgetItem([k, v])
-                parent.addChild(child)
-            parent.setExpanded(True)
+            parent, old_entries = previous.get(cat, (None, {}))
+            if parent is None:
+                parent = QTreeWidgetItem([cat, ""])
+                parent.setFlags(parent.flags() & ~Qt.ItemIsSelectable)
+            entries = []
+            for i in categories[cat]:
+                k, v = keys[i], values[i]
+                old = old_entries.get(k)
+                if old is None:
+                    child = QTreeWidgetItem([k, v])
+                else:
+                    child = old[0]
+                    if old[2] != v:
+                        child.setText(1, v)
+                entries.append((child, k, v, f"{k}\n{v}".lower()))
+            if [entry[1] for entry in entries] != list(old_entries):
+                parent.takeChildren()
+                parent.addChildren([entry[0] for entry in entries])
+            index.append((parent, entries))
+        self._prop_index = index
+
+        if sorted(categories.keys()) != previous_order:
+            parents = [parent for parent, _ in index]
+            self.props_tree.invisibleRootItem().takeChildren()
+            self.props_tree.addTopLevelItems(parents)
+            for parent in parents:
+                parent.setExpanded(True)
 
     def apply_property_filter(self):
         """Filter visible rows by substring or regex on key/value."""
         pattern = self.filter_edit.text().strip()
         regex = None
-        if pattern:
+        # Patterns without regex metacharacters are matched as plain substrings
+        if pattern and re.escape(pattern) != pattern:
             try:
                 regex = re.compile(pattern, re.IGNORECASE)
             except re.error:
                 # Fallback to plain substring
                 regex = None
+        needle = pattern.lower()
 
-        def match(text):
-            if not pattern:
-                return True
-            if regex:
-                return bool(regex.search(text))
-            return pattern.lower() in text.lower()
-
-        for i in range(self.props_tree.topLevelItemCount()):
-            parent = self.props_tree.topLevelItem(i)
+        for parent, entries in self._prop_index:
             visible_children = 0
-            for j in range(parent.childCount()):
-                child = parent.child(j)
-                key = child.text(0)
-                val = child.text(1)
-                is_match = match(key) or match(val)
+            for child, key, val, haystack in entries:
+                if regex:
+                    is_match = bool(regex.search(key) or regex.search(val))
+                else:
+                    # The needle has no newline, so it can't match across key and value
+                    is_match = needle in haystack
                 child.setHidden(not is_match)
                 if is_match:
                     visible_children += 1
@@ -614,16 +1407,11 @@ class PartitionDumper(QWidget):
 
     def collect_visible_properties(self):
         """Collect currently visible key: value pairs from the tree."""
-        lines = []
-        for i in range(self.props_tree.topLevelItemCount()):
-            parent = self.props_tree.topLevelItem(i)
-            if parent.isHidden():
-                continue
-            for j in range(parent.childCount()):
-                child = parent.child(j)
-                if not child.isHidden():
-                    lines.append(f"{child.text(0)}: {child.text(1)}")
-        return "\n".join(lines)
+        # Keys and values come from the filter index; only visibility is asked of Qt
+        return "\n".join(f"{key}: {val}"
+                         for _, entries in self._prop_index
+                         for child, key, val, _ in entries
+                         if not child.isHidden())
 
     # Copy/Export actions
 
@@ -682,24 +1470,55 @@ class PartitionDumper(QWidget):
             if hasattr(self, 'status_label'):
                 self.status_label.setText(f"Status: Copy failed - {str(e)}")
 
+    def refresh_device(self):
+        """Drop cached device data and reload the device properties."""
+        self._props_dict = {}
+        self._device_info_cache.clear()
+        # A different device may allow adb pull again
+        DumpTask.pull_supported = True
+        self._device_info_loaded = True
+        # ...and would otherwise be shown the previous device's cached properties
+        self.update_device_serial()
+        self.load_device_info()
+
     def get_device_info(self):
-        """Get device name and serial for folder naming"""
+        """Get device name and serial for folder naming (memoized per serial)"""
         try:
+            # With nothing known about any device yet getprop will be needed
+            # anyway, so it runs alongside the serial query instead of after it
+            prefetch = None
+            prefetched = []
+            if not self._device_info_cache and not self._props_dict:
+                prefetch = threading.Thread(
+                    target=lambda: prefetched.append(run_adb_shell('getprop')), daemon=True)
+                prefetch.start()
+
             # Get device serial
-            result = subprocess.run(['adb', 'get-serialno'], 
-                                  capture_output=True, text=True, check=True)
+            result = get_adb_serialno()
+            result.check_returncode()
             serial = result.stdout.strip()
+            if serial in self._device_info_cache:
+                return self._device_info_cache[serial]
             
-            # Try to get device model from the loaded properties
-            if hasattr(self, 'all_properties'):
-                # Parse for ro.product.model
-                for line in self.all_properties.split('\n'):
-                    if 'ro.product.model' in line and ']: [' in line:
-                        device_name = line.split(']: [')[1].rstrip(']')
-                        if device_name and device_name != 'unknown':
-                            return device_name, serial
+            # Reuse the properties already parsed for the Device Info tab if
+            # they belong to this device; otherwise fetch them with one getprop
+            same_device = serial == getattr(self, 'device_serial', '')
+            props = self._props_dict if same_device else {}
+            if not props:
+                if prefetch is not None:
+                    prefetch.join()
+                # A prefetch that couldn't reach adb at all is simply run again here
+                result = prefetched[0] if prefetched else run_adb_shell('getprop')
+                result.check_returncode()
+                if same_device:
+                    # Also fills (and caches) the Device Info tab, so opening
+                    # it later doesn't run getprop a second time
+                    self._on_device_info_loaded((serial, result.stdout))
+                    self._device_info_loaded = True
+                    props = self._props_dict
+                else:
+                    props = self.parse_getprop_output(result.stdout)
             
-            # Fallback to original method
             device_props = [
                 'ro.product.model',
                 'ro.product.name', 
@@ -708,62 +1527,170 @@ class PartitionDumper(QWidget):
             
             device_name = "Unknown"
             for prop in device_props:
-                result = subprocess.run(['adb', 'shell', f'getprop {prop}'], 
-                                      capture_output=True, text=True, check=True)
-                value = result.stdout.strip()
+                value = props.get(prop, "").strip()
                 if value and value.lower() not in ['unknown', '', 'android']:
                     device_name = value
                     break
             
+            self._device_info_cache[serial] = (device_name, serial)
             return device_name, serial
         except subprocess.CalledProcessError:
             return "Unknown", "Unknown"
 
+    def _on_track_devices_output(self):
+        """Parse `adb track-devices` updates and forget devices that went away."""
+        self._track_buffer += bytes(self.device_tracker.readAllStandardOutput())
+        # Each update is the full device list, prefixed by its length in 4 hex digits
+        while len(self._track_buffer) >= 4:
+            try:
+                length = int(self._track_buffer[:4], 16)
+            except ValueError:
+                self._track_buffer = b''
+                return
+            if len(self._track_buffer) < 4 + length:
+                return
+            payload = self._track_buffer[4:4 + length].decode('utf-8', 'replace')
+            self._track_buffer = self._track_buffer[4 + length:]
+            online = {line.split('\t')[0] for line in payload.splitlines()
+                      if line.endswith('\tdevice')}
+            for serial in list(self._device_info_cache):
+                if serial not in online:
+                    del self._device_info_cache[serial]
+
+    def closeEvent(self, event):
+        """Cancel running dumps and stop the device tracker along with the window."""
+        # Otherwise the transfers keep running after the event loop returns
+        # and their signals outlive the window
+        if self._running_dumps:
+            self.cancel_dumps()
+            self.dump_pool.waitForDone()
+        self.device_tracker.kill()
+        self.device_tracker.waitForFinished(1000)
+        super().closeEvent(event)
+
     def dump_partitions(self):
-        """Dumps selected partitions with improved error handling."""
+        """Queue selected partitions as DumpTasks on the dump thread pool."""
+        if self._running_dumps:
+            self.status_changed.emit("Status: Dump already in progress")
+            return
+
         # First ensure output directory exists
         if not self.ensure_output_directory():
             return
             
-        count = self.list_widget.topLevelItemCount()
-        selected_items = [self.list_widget.topLevelItem(i) for i in range(count)
-                        if self.list_widget.topLevelItem(i).checkState(0) == Qt.Checked]
+        selected_items = [item for item in self._partition_items
+                          if item.checkState(0) == Qt.Checked]
         if not selected_items:
-            self.status_label.setText("Status: No partitions selected")
+            self.status_changed.emit("Status: No partitions selected")
             return
             
         output_path = self.get_resolved_output_path()
+        self._dump_output_path = output_path
         
+        # Validate names and build every target path up front so the
+        # hand-off to the pool below carries only ready-made jobs
+        targets = []
+        seen = set()
         for item in selected_items:
             part = item.text(0)
-            # Sanitize partition name
-            safe_part = "".join(c for c in part if c.isalnum() or c in ('-', '_'))
-            if safe_part != part:
-                self.status_label.setText(f"Status: Invalid partition name: {part}")
+            # Reject names that aren't plain identifiers instead of rewriting them
+            if not _PARTITION_NAME.fullmatch(part):
+                self.status_changed.emit(f"Status: Invalid partition name: {part}")
                 item.setText(2, "Failed")
                 continue
-                
-            self.status_label.setText(f"Dumping {part}...")
-            QApplication.processEvents()
-            
-            dump_file = os.path.join(output_path, f"{part}.img")
-            
-            try:
-                # Use shlex.quote for proper escaping
-                cmd = f'adb exec-out dd if=/dev/block/by-name/{safe_part} bs=4096 status=none > {shlex.quote(dump_file)}'
-                result = subprocess.run(cmd, shell=True, check=True)
-                
-                # Verify file was created and has content
-                if os.path.exists(dump_file) and os.path.getsize(dump_file) > 0:
-                    item.setText(2, "Done")
-                else:
-                    item.setText(2, "Failed")
-                    
-            except subprocess.CalledProcessError as e:
-                self.status_label.setText(f"Status: Error dumping {part}: {str(e)}")
+            # Rows sharing a name (e.g. "unknown") would write the same image
+            if part in seen:
+                self.status_changed.emit(f"Status: Duplicate partition name: {part}")
                 item.setText(2, "Failed")
-                
-        self.status_label.setText(f"Status: Dump completed to {output_path}")
+                continue
+            seen.add(part)
+            targets.append((item, part, os.path.join(output_path, f"{part}.img"),
+                            item.data(0, Qt.UserRole)))
+
+        # Longest transfers first (LPT scheduling): the small partitions then
+        # fill the other slots while the big ones run, instead of a big one
+        # starting last and running alone. Unknown sizes go last. Tasks are
+        # handed to the pool one at a time as transfers end, so they start
+        # in exactly this order.
+        targets.sort(key=lambda target: target[3] or 0, reverse=True)
+
+        self.dump_pool.setMaxThreadCount(self.parallel_spin.value() * 2)
+
+        for item, part, dump_file, size_bytes in targets:
+            item.setText(2, "Queued")
+            task = DumpTask(part, dump_file, size_bytes)
+            task.signals.started.connect(self._on_dump_started)
+            task.signals.progress.connect(self._on_dump_progress)
+            task.signals.transferred.connect(self._on_dump_transferred)
+            task.signals.finished.connect(self._on_dump_finished)
+            self._running_dumps[task] = item
+            self._dump_queue.append(task)
+
+        if not self._running_dumps:
+            return
+
+        self._dump_cancelled = False
+        self.dump_button.setEnabled(False)
+        self.parallel_spin.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self._transfers_running = 0
+        self.start_queued_dumps()
+
+    def start_queued_dumps(self):
+        """Start queued DumpTasks in order until the parallel setting is reached."""
+        while self._dump_queue and self._transfers_running < self.parallel_spin.value():
+            self._transfers_running += 1
+            self.dump_pool.start(self._dump_queue.popleft())
+
+    def cancel_dumps(self):
+        """Cancel every queued and running dump of the current batch."""
+        self._dump_cancelled = True
+        self.cancel_button.setEnabled(False)
+        # Queued tasks were never handed to the pool
+        while self._dump_queue:
+            task = self._dump_queue.popleft()
+            task.cancel()
+            self._on_dump_finished(task, False, "cancelled")
+        for task in list(self._running_dumps):
+            task.cancel()
+            # Tasks still waiting in the pool never run, so never report back
+            if self.dump_pool.tryTake(task):
+                self._transfers_running -= 1
+                self._on_dump_finished(task, False, "cancelled")
+
+    def _on_dump_started(self, task):
+        """Mark a partition as being transferred."""
+        self._running_dumps[task].setText(2, "Dumping")
+        self.status_changed.emit(f"Dumping {task.part}...")
+
+    def _on_dump_progress(self, task, percent):
+        """Show how much of a partition has been transferred."""
+        self._running_dumps[task].setText(2, f"{percent}%")
+
+    def _on_dump_transferred(self, task):
+        """Start the next queued transfer once a dump's adb transfer has ended."""
+        self._transfers_running -= 1
+        self.start_queued_dumps()
+
+    def _on_dump_finished(self, task, ok, message):
+        """Record the result of one dump; report completion once all are done."""
+        item = self._running_dumps.pop(task)
+        if ok:
+            item.setText(2, "Done")
+        elif task.cancelled:
+            item.setText(2, "Cancelled")
+        else:
+            self.status_changed.emit(f"Status: Error dumping {task.part}: {message}")
+            item.setText(2, "Failed")
+
+        if not self._running_dumps:
+            self.dump_button.setEnabled(True)
+            self.parallel_spin.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+            if self._dump_cancelled:
+                self.status_changed.emit("Status: Dump cancelled")
+            else:
+                self.status_changed.emit(f"Status: Dump completed to {self._dump_output_path}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)